@@ -7,21 +7,37 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime
-import plotly.graph_objects as go
 
 
 # Import utility modules
 from utils.common import (
     display_svg, generate_sample_data, predict_ca_risk,
-    plot_risk_gauge, plot_feature_importance, get_recommendation,
-    on_student_id_change, on_calculate_risk, on_calculate_what_if
+    plot_risk_gauge, cached_risk_gauge, plot_feature_importance, get_recommendation,
+    on_student_id_change, on_calculate_risk, on_calculate_what_if,
+    compute_risk_scores, update_data_status, get_model_container,
+    set_trained_model, has_data
+)
+# The per-mode render modules are imported lazily inside main() so cold
+# start only pays for the mode actually selected; Python's module cache
+# makes each import a no-op after the first use.
+
+# Frozen at import time so the sidebar footer does not call datetime.now()
+# on every rerun
+_FOOTER_YEAR = datetime.now().year
+
+# Static page header, built once at import. It must still be emitted on
+# every rerun — Streamlit removes elements that are not re-emitted — but as
+# a single markdown delta instead of two string constructions.
+_HEADER_HTML = (
+    "<h1 class='main-header'>Chronic Absenteeism Predictor</h1>"
+    "<p class='sub-header'>Identify at-risk students and plan effective interventions</p>"
+)
+
+# Section banner for System Training, likewise constant per process
+_TRAINING_HEADER_HTML = (
+    "<div class='icon-header'><span class='emoji'>🧠</span>"
+    "<h2>System Training</h2></div>"
 )
-from utils.training_data import render_training_data_tab
-from utils.model_params import render_model_params_tab
-from utils.training_results import render_training_results_tab
-from utils.batch_prediction import render_batch_prediction
-from utils.advanced_analytics import render_advanced_analytics
-from utils.system_settings import render_system_settings
 
 # Set page config
 st.set_page_config(
@@ -31,145 +47,79 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Session state defaults, applied once per session
+_SESSION_DEFAULTS = {
+    'model': None,
+    'training_report': None,
+    'feature_names': None,
+    'training_status': None,
+    'current_prediction': None,
+    'calculation_complete': False,
+}
+
+# Everything RESET SYSTEM discards; grows in one place as keys accumulate
+_RESET_KEYS = (
+    'training_report', 'prediction_results', 'prediction_results_arrow',
+    'current_prediction',
+    'calculation_complete', 'feature_names', 'training_status',
+    'student_overrides', 'student_defaults', '_form_student', '_student_query',
+)
+
 # Initialize session state variables
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'model' not in st.session_state:
-        st.session_state.model = None
-    
-    if 'historical_data' not in st.session_state:
-        st.session_state.historical_data = pd.DataFrame()
-    
-    if 'current_year_data' not in st.session_state:
-        st.session_state.current_year_data = pd.DataFrame()
-    
-    if 'training_report' not in st.session_state:
-        st.session_state.training_report = None
-    
-    if 'feature_names' not in st.session_state:
-        st.session_state.feature_names = None
-    
-    if 'training_status' not in st.session_state:
-        st.session_state.training_status = None
-    
-    if 'current_prediction' not in st.session_state:
-        st.session_state.current_prediction = None
-    
-    if 'calculation_complete' not in st.session_state:
-        st.session_state.calculation_complete = False
+    if st.session_state.get('_init'):
+        return
+
+    for key, value in _SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
+
+    # None is the "not loaded" sentinel; uploads replace it with a real
+    # DataFrame, so fresh sessions allocate nothing
+    st.session_state.setdefault('historical_data', None)
+    st.session_state.setdefault('current_year_data', None)
+
+    # Pick up a model trained in another session; the container holds it
+    # by reference so this is a dict lookup, not a copy
+    if st.session_state.model is None:
+        st.session_state.model = get_model_container()['model']
+
+    st.session_state._init = True
+
+@st.cache_resource(show_spinner=False)
+def _css():
+    """Read the stylesheet from assets/app.css once per process
+
+    The markdown call itself must stay in every rerun because Streamlit
+    removes elements that are not re-emitted.
+    """
+    with open(os.path.join("assets", "app.css")) as f:
+        return f"<style>\n{f.read()}\n</style>"
 
-# Apply custom CSS
 def apply_custom_css():
     """Apply custom CSS styling"""
-    css = """
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1E88E5;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    
-    .sub-header {
-        font-size: 1.5rem;
-        color: #424242;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    
-    .section-card {
-        background-color: #FFFFFF;
-        border-radius: 10px;
-        padding: 1.5rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin-bottom: 2rem;
-    }
-    
-    .card-title {
-        font-size: 1.5rem;
-        color: #1E88E5;
-        margin-bottom: 1rem;
-        border-bottom: 1px solid #E0E0E0;
-        padding-bottom: 0.5rem;
-    }
-    
-    .card-subtitle {
-        font-size: 1.2rem;
-        color: #424242;
-        margin-bottom: 0.5rem;
-    }
-    
-    .info-box {
-        background-color: #E3F2FD;
-        border-left: 4px solid #1E88E5;
-        padding: 1rem;
-        margin-bottom: 1rem;
-    }
-    
-    .warning-box {
-        background-color: #FFF8E1;
-        border-left: 4px solid #FFC107;
-        padding: 1rem;
-        margin-bottom: 1rem;
-    }
-    
-    .success-box {
-        background-color: #E8F5E9;
-        border-left: 4px solid #4CAF50;
-        padding: 1rem;
-        margin-bottom: 1rem;
-    }
-    
-    .icon-header {
-        display: flex;
-        align-items: center;
-        gap: 10px;
-    }
-    
-    .icon-header .emoji {
-        font-size: 2rem;
-    }
-    
-    .icon-header h2 {
-        margin: 0;
-    }
-    
-    .disabled-field {
-        opacity: 0.7;
-        pointer-events: none;
-    }
-    
-    .recommendation {
-        background-color: #F5F5F5;
-        padding: 1rem;
-        border-radius: 5px;
-        margin-top: 0.5rem;
-    }
-    </style>
-    """
-    st.markdown(css, unsafe_allow_html=True)
+    st.markdown(_css(), unsafe_allow_html=True)
+
+@st.cache_data(show_spinner=False)
+def _load_logo_markup(path):
+    """Read and prepare the sidebar logo markup once per session"""
+    if os.path.exists(path):
+        return display_svg(path, width="100%")
+    return None
+
+def _render_sidebar_static():
+    """Render the sidebar parts that never change between reruns"""
+    markup = _load_logo_markup("images/logo.svg")
+    if markup:
+        st.sidebar.markdown(markup, unsafe_allow_html=True)
 
-# Create a sidebar menu
-def render_sidebar():
-    """Render the sidebar menu"""
-    # Logo & title
-    if os.path.exists("images/logo.svg"):
-        st.sidebar.markdown(display_svg("images/logo.svg", width="100%"), unsafe_allow_html=True)
-    
     st.sidebar.title("CA Predictor")
     st.sidebar.markdown("---")
-    
-    # Navigation
-    app_mode = st.sidebar.radio(
-        "Navigation",
-        options=["System Training", "Batch Prediction", "Advanced Analytics", "System Settings"]
-    )
-    
-    st.sidebar.markdown("---")
-    
-    # System status
+
+def _render_sidebar_status():
+    """Render the live system-status block (the only part reading session state)"""
     st.sidebar.markdown("### System Status")
-    
+
     # Model status - ensure the warning/success indicators match the actual state
     if st.session_state.model is not None:
         model_type = st.session_state.active_model if 'active_model' in st.session_state else 'unknown'
@@ -177,71 +127,110 @@ def render_sidebar():
         st.sidebar.success(f"✅ Model: {model_name} (Trained)")
     else:
         st.sidebar.error("❌ Model: Not Trained")
-    
-    # Data status - match warning/error colors for consistency
-    if not st.session_state.historical_data.empty:
-        st.sidebar.success(f"✅ Training Data: {len(st.session_state.historical_data)} records")
+
+    # Data status - counts are cached at mutation time (update_data_status)
+    # so the hot rerun path reads plain ints instead of the DataFrames
+    status = st.session_state.get('_data_status', {'hist_n': 0, 'curr_n': 0})
+    if status['hist_n']:
+        st.sidebar.success(f"✅ Training Data: {status['hist_n']} records")
     else:
         st.sidebar.error("❌ Training Data: Not Loaded")
-    
-    if not st.session_state.current_year_data.empty:
-        st.sidebar.success(f"✅ Current Data: {len(st.session_state.current_year_data)} records")
+
+    if status['curr_n']:
+        st.sidebar.success(f"✅ Current Data: {status['curr_n']} records")
     else:
         st.sidebar.error("❌ Current Data: Not Loaded")
-    
+
+# Create a sidebar menu
+def render_sidebar():
+    """Render the sidebar menu"""
+    _render_sidebar_static()
+
+    # Navigation
+    app_mode = st.sidebar.radio(
+        "Navigation",
+        options=["System Training", "Batch Prediction", "Advanced Analytics", "System Settings"]
+    )
+
+    st.sidebar.markdown("---")
+
+    _render_sidebar_status()
+
     # System Reset button in sidebar
     st.sidebar.markdown("---")
     st.sidebar.info("Use this button to completely reset the system and start from scratch.")
     if st.sidebar.button("RESET SYSTEM", help="Clear all data and reset the system"):
         # Reset the session state
-        st.session_state.historical_data = pd.DataFrame()
-        st.session_state.current_year_data = pd.DataFrame()
-        st.session_state.model = None
-        if 'training_report' in st.session_state:
-            del st.session_state.training_report
-        if 'prediction_results' in st.session_state:
-            del st.session_state.prediction_results
-        
+        for key in _RESET_KEYS:
+            st.session_state.pop(key, None)
+        st.session_state.update({'historical_data': None, 'current_year_data': None})
+        set_trained_model(None)
+        update_data_status()
+
         st.sidebar.success("✅ System reset complete! Please upload new data to begin.")
     
     # Footer
     st.sidebar.markdown("---")
-    st.sidebar.markdown(f"Version 1.0.0")
-    st.sidebar.markdown(f"© {datetime.now().year} CA Predictor")
+    st.sidebar.markdown("Version 1.0.0")
+    st.sidebar.markdown(f"© {_FOOTER_YEAR} CA Predictor")
     
     return app_mode
 
 # Individual Student Prediction
 
-import streamlit as st
-import plotly.graph_objects as go
-import pandas as pd
+# Stable widget keys for the student form, mapped to the student-record
+# fields that seed them when the selected student changes
+_FORM_FIELDS = {
+    'school': 'School',
+    'grade': 'Grade',
+    'present': 'Present_Days',
+    'absent': 'Absent_Days',
+    'academic': 'Academic_Performance',
+    'gender': 'Gender',
+    'meal': 'Meal_Code',
+}
 
-def plot_risk_gauge(risk_value):
-    """Create a properly sized risk gauge visualization"""
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=risk_value*100,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': "Absenteeism Risk Score", 'font': {'size': 14}},
-        gauge={
-            'axis': {'range': [None, 100], 'tickwidth': 1},
-            'steps': [
-                {'range': [0, 30], 'color': "lightgreen"},
-                {'range': [30, 70], 'color': "yellow"},
-                {'range': [70, 100], 'color': "red"}],
-            'threshold': {
-                'line': {'color': "black", 'width': 4},
-                'thickness': 0.75,
-                'value': risk_value*100}
-        }
-    ))
-    fig.update_layout(
-        height=300,  # Fixed height
-        width=400,   # Fixed width
-        margin=dict(t=50, b=10, l=50, r=50)
-    )
-    return fig
+# Fixed selectbox choices, built once at import instead of per rerun
+_GENDER_OPTS = ("Male", "Female", "Other")
+_MEAL_OPTS = ("Free", "Reduced", "Paid")
+_DEFAULT_SCHOOL_OPTS = ("North High", "South High", "East Middle",
+                        "West Elementary", "Central Academy")
+
+# Cap on how many IDs the student picker sends to the browser at once;
+# selectboxes get sluggish past a few thousand options
+_SEARCH_LIMIT = 50
+
+# The underscore-prefixed DataFrame is excluded from hashing; the cache
+# key is the version token update_data_status() bumps on every upload or
+# reset. That avoids content-hashing large rosters per rerun without
+# relying on id(), whose values get recycled after garbage collection.
+@st.cache_data(show_spinner=False)
+def _student_index(_df, version):
+    """Build a Student_ID -> row dict lookup so student access is O(1) per rerun
+
+    Uses set_index so the hashtable is built once by pandas; the first
+    occurrence wins for duplicate IDs, matching the old .iloc[0] behavior.
+    """
+    indexed = _df.drop_duplicates('Student_ID', keep='first').set_index('Student_ID', drop=False)
+    return indexed.to_dict('index')
+
+@st.cache_data(show_spinner=False)
+def _student_ids(_df, version):
+    """Cache the unique Student_ID list so it is not rebuilt on every rerun"""
+    ids = _df['Student_ID']
+    if isinstance(ids.dtype, pd.CategoricalDtype):
+        # Categorical IDs keep their uniques in the dtype already
+        return ids.cat.categories.tolist()
+    return ids.dropna().unique().tolist()
+
+@st.cache_data(show_spinner=False)
+def _school_options(_df, version):
+    """Cache the school choices for the roster instead of scanning per rerun"""
+    if 'School' in _df.columns:
+        schools = _df['School'].dropna().unique().tolist()
+        if schools:
+            return schools
+    return list(_DEFAULT_SCHOOL_OPTS)
 
 def get_risk_explanation(risk_value, student_data):
     """Generate clear explanation of risk factors"""
@@ -254,10 +243,15 @@ def get_risk_explanation(risk_value, student_data):
     else:
         explanations.append("✅ **Low Risk Level** (Good attendance patterns)")
     
-    present_days = student_data.get('Present_Days', 0)
-    absent_days = student_data.get('Absent_Days', 1)
-    attendance_pct = (present_days / (present_days + absent_days)) * 100
-    
+    # Prefer the precomputed column from add_derived_columns when available
+    if 'Attendance_Rate' in student_data:
+        attendance_pct = student_data['Attendance_Rate']
+    else:
+        present_days = student_data.get('Present_Days', 0)
+        absent_days = student_data.get('Absent_Days', 1)
+        total_days = present_days + absent_days
+        attendance_pct = (present_days / total_days) * 100 if total_days else 0.0
+
     if attendance_pct < 85:
         explanations.append(f"• Low attendance rate ({attendance_pct:.1f}%)")
     
@@ -329,23 +323,25 @@ def get_recommendation_with_reasons(risk_value, student_data):
 def on_calculate_risk():
     """Calculate risk score based on form inputs"""
     try:
+        # student_select holds the shortlist index, so 0 is a valid
+        # selection - only a missing key means no student is picked
         selected_id = st.session_state.get("student_select")
-        if not selected_id:
+        if selected_id is None:
             st.error("No student selected")
             return
         
         inputs = {
-            'Present_Days': st.session_state.get(f"present_{selected_id}", 150),
-            'Absent_Days': st.session_state.get(f"absent_{selected_id}", 10),
-            'Academic_Performance': st.session_state.get(f"academic_{selected_id}", 70),
-            'Grade': st.session_state.get(f"grade_{selected_id}", 9),
-            'Meal_Code': st.session_state.get(f"meal_{selected_id}", 'Free')
+            'Present_Days': st.session_state.get("present", 150),
+            'Absent_Days': st.session_state.get("absent", 10),
+            'Academic_Performance': st.session_state.get("academic", 70),
+            'Grade': st.session_state.get("grade", 9),
+            'Meal_Code': st.session_state.get("meal", 'Free')
         }
         
-        attendance_rate = inputs['Present_Days'] / (inputs['Present_Days'] + inputs['Absent_Days'])
-        academic_factor = 1 - (inputs['Academic_Performance'] / 100)
-        risk_score = (0.6 * (1 - attendance_rate)) + (0.4 * academic_factor)
-        
+        risk_score = compute_risk_scores(
+            inputs['Present_Days'], inputs['Absent_Days'], inputs['Academic_Performance']
+        )
+
         st.session_state.current_prediction = risk_score
         st.session_state.current_student_data = inputs
         
@@ -353,15 +349,20 @@ def on_calculate_risk():
         st.error(f"Calculation error: {str(e)}")
         st.session_state.current_prediction = None
 
+@st.fragment
 def render_individual_prediction():
-    """Main prediction interface"""
+    """Main prediction interface
+
+    Runs as a fragment so widget interactions here rerun only this block
+    instead of the whole page (requires Streamlit >= 1.33).
+    """
     if 'current_prediction' not in st.session_state:
         st.session_state.current_prediction = None
     
     st.markdown("<div class='section-card'>", unsafe_allow_html=True)
     st.markdown("<div class='card-title'>👨‍🎓 Student Risk Analysis</div>", unsafe_allow_html=True)
     
-    if 'current_year_data' not in st.session_state:
+    if not has_data('current_year_data'):
         st.error("Please upload current-year data first")
         return
     
@@ -375,144 +376,180 @@ def render_individual_prediction():
         st.error(f"Missing columns: {', '.join(missing_cols)}")
         return
     
+    data_version = st.session_state.get('_data_version', 0)
+
     try:
-        current_students = st.session_state.current_year_data['Student_ID'].dropna().unique().tolist()
+        current_students = _student_ids(st.session_state.current_year_data, data_version)
         if not current_students:
             st.error("No valid student IDs found")
             return
     except Exception as e:
         st.error(f"Data error: {str(e)}")
         return
-    
-    selected_id = st.selectbox(
+
+    # Narrow large rosters server-side: the selectbox only ever receives a
+    # shortlist, never the full ID list
+    query = st.text_input(
+        "Search Student ID",
+        key="student_search",
+        placeholder="Type part of an ID to narrow the list"
+    )
+    if query:
+        needle = query.strip().lower()
+        shortlist = [s for s in current_students
+                     if needle in str(s).lower()][:_SEARCH_LIMIT]
+    else:
+        shortlist = current_students[:_SEARCH_LIMIT]
+
+    if len(current_students) > len(shortlist):
+        st.caption(f"Showing {len(shortlist)} of {len(current_students)} students — refine the search to see others")
+
+    if not shortlist:
+        st.info("No student IDs match the search.")
+        return
+
+    # Drop the stale selection when the shortlist changes so the widget
+    # cannot hold an index past the new list's end
+    if st.session_state.get('_student_query') != query:
+        st.session_state.pop('student_select', None)
+        st.session_state._student_query = query
+
+    # Ship integer indices to the frontend instead of ID strings; the
+    # labels are still rendered via format_func from the shortlist
+    selected_idx = st.selectbox(
         "Select Student",
-        options=current_students,
+        options=range(len(shortlist)),
+        format_func=shortlist.__getitem__,
         index=0,
         key="student_select"
     )
-    
+    selected_id = shortlist[selected_idx]
+
     try:
-        student_data = st.session_state.current_year_data[
-            st.session_state.current_year_data['Student_ID'] == selected_id
-        ].iloc[0]
-    except IndexError:
+        student_data = _student_index(st.session_state.current_year_data, data_version)[selected_id]
+    except KeyError:
         st.error("Student not found")
         return
     
-    current_student = {
-        'School': str(student_data.get('School', '')),
-        'Grade': int(student_data.get('Grade', 9)),
-        'Present_Days': int(student_data.get('Present_Days', 150)),
-        'Absent_Days': int(student_data.get('Absent_Days', 10)),
-        'Academic_Performance': int(student_data.get('Academic_Performance', 70)),
-        'Gender': str(student_data.get('Gender', 'Male')),
-        'Meal_Code': str(student_data.get('Meal_Code', 'Free'))
-    }
-    
+    # Seed the stable widget keys once per student change; the str/int
+    # casts out of the record run only here, not on every keystroke. Using
+    # the same keys for every student keeps session_state and the frontend
+    # widget registry at O(widgets) instead of O(students x widgets);
+    # per-student edits are preserved in st.session_state.student_overrides.
+    if st.session_state.get('_form_student') != selected_id:
+        st.session_state.student_defaults = {
+            'School': str(student_data.get('School', '')),
+            'Grade': int(student_data.get('Grade', 9)),
+            'Present_Days': int(student_data.get('Present_Days', 150)),
+            'Absent_Days': int(student_data.get('Absent_Days', 10)),
+            'Academic_Performance': int(student_data.get('Academic_Performance', 70)),
+            'Gender': str(student_data.get('Gender', 'Male')),
+            'Meal_Code': str(student_data.get('Meal_Code', 'Free'))
+        }
+        overrides = st.session_state.setdefault('student_overrides', {})
+        saved = overrides.get(selected_id, {})
+        for state_key, field in _FORM_FIELDS.items():
+            st.session_state[state_key] = saved.get(field, st.session_state.student_defaults[field])
+        st.session_state._form_student = selected_id
+
+    current_student = st.session_state.student_defaults
+
     with st.form(key="student_form"):
         col1, col2 = st.columns(2)
-        
+
         with col1:
-            # Get unique schools from the data to populate options
-            school_options = st.session_state.current_year_data['School'].dropna().unique().tolist()
-            # If no schools found in data, use default options
-            if not school_options:
-                school_options = ["North High", "South High", "East Middle", "West Elementary", "Central Academy"]
-            
-            school_value = current_student['School']
-            # If the school value from data isn't in options, add it
+            school_options = _school_options(st.session_state.current_year_data, data_version)
+
+            # If the seeded school value isn't in options, add it (on a
+            # copy so the cached list is not mutated)
+            school_value = st.session_state.get('school')
             if school_value and school_value not in school_options:
-                school_options.append(school_value)
-            
-            school_index = school_options.index(school_value) if school_value in school_options else 0
+                school_options = school_options + [school_value]
+
             st.selectbox(
                 "School",
                 options=school_options,
-                index=school_index,
-                key=f"school_{selected_id}"
+                key="school"
             )
-            
+
             st.number_input(
                 "Grade",
                 min_value=1,
                 max_value=12,
-                value=current_student['Grade'],
-                key=f"grade_{selected_id}"
+                key="grade"
             )
-            
+
             present_days = st.number_input(
                 "Present Days",
                 min_value=0,
                 max_value=200,
-                value=current_student['Present_Days'],
-                key=f"present_{selected_id}"
+                key="present"
             )
-            
+
             absent_days = st.number_input(
                 "Absent Days",
                 min_value=0,
                 max_value=200,
-                value=current_student['Absent_Days'],
-                key=f"absent_{selected_id}"
+                key="absent"
             )
-            
+
             total_days = present_days + absent_days
             attendance_pct = (present_days/total_days*100 if total_days>0 else 0)
             st.metric(
-                "Attendance Rate", 
+                "Attendance Rate",
                 f"{attendance_pct:.1f}%"
             )
-        
+
         with col2:
             academic_performance = st.slider(
                 "Academic Performance %",
                 min_value=0,
                 max_value=100,
-                value=current_student['Academic_Performance'],
-                key=f"academic_{selected_id}"
+                key="academic"
             )
-            
-            gender_options = ["Male", "Female", "Other"]
-            gender_value = current_student['Gender']
-            gender_index = gender_options.index(gender_value) if gender_value in gender_options else 0
+
+            if st.session_state.get('gender') not in _GENDER_OPTS:
+                st.session_state.gender = _GENDER_OPTS[0]
             st.selectbox(
                 "Gender",
-                options=gender_options,
-                index=gender_index,
-                key=f"gender_{selected_id}"
+                options=_GENDER_OPTS,
+                key="gender"
             )
-            
-            meal_options = ["Free", "Reduced", "Paid"]
-            meal_value = current_student['Meal_Code']
-            meal_index = meal_options.index(meal_value) if meal_value in meal_options else 0
+
+            if st.session_state.get('meal') not in _MEAL_OPTS:
+                st.session_state.meal = _MEAL_OPTS[0]
             st.selectbox(
                 "Meal Status",
-                options=meal_options,
-                index=meal_index,
-                key=f"meal_{selected_id}"
+                options=_MEAL_OPTS,
+                key="meal"
             )
-        
+
         if st.form_submit_button("Analyze Risk"):
+            # Remember this student's edits before the rerun
+            st.session_state.setdefault('student_overrides', {})[selected_id] = {
+                field: st.session_state[state_key]
+                for state_key, field in _FORM_FIELDS.items()
+            }
+
             # Calculate attendance percentage
             attendance_pct = (present_days/(present_days + absent_days)) * 100 if (present_days + absent_days) > 0 else 0
-            
+
             # Automatically set to high risk if attendance <= 90%
             if attendance_pct <= 90:
                 st.session_state.current_prediction = 0.8  # High risk value (0.8 is 80% probability)
                 st.warning("Automatically flagged as high risk due to low attendance (≤90%)")
             else:
                 # Normal risk calculation
-                attendance_rate = present_days / (present_days + absent_days)
-                academic_factor = 1 - (academic_performance / 100)
-                risk_score = (0.6 * (1 - attendance_rate)) + (0.4 * academic_factor)
-                st.session_state.current_prediction = risk_score
-            
+                st.session_state.current_prediction = compute_risk_scores(
+                    present_days, absent_days, academic_performance
+                )
+
             st.session_state.current_student_data = {
                 'Present_Days': present_days,
                 'Absent_Days': absent_days,
                 'Academic_Performance': academic_performance,
                 'Grade': current_student['Grade'],
-                'Meal_Code': meal_options[meal_index],
+                'Meal_Code': st.session_state.meal,
                 'Attendance_Percentage': attendance_pct
             }
             st.rerun()
@@ -525,7 +562,7 @@ def render_individual_prediction():
         
         with col1:
             st.plotly_chart(
-                plot_risk_gauge(risk_value),
+                cached_risk_gauge(round(risk_value, 2)),
                 use_container_width=True,
                 config={'displayModeBar': False}
             )
@@ -541,13 +578,18 @@ def render_individual_prediction():
             st.markdown(get_risk_explanation(risk_value, student_data))
             
             st.markdown("### Recommended Actions")
-            for intervention, reason in get_recommendation_with_reasons(risk_value, student_data):
-                st.markdown(f"""
+            # Emit all interventions as one markdown delta instead of one
+            # frontend message per recommendation
+            interventions_html = ''.join(
+                f"""
                 <div style="padding:10px; margin:8px 0; border-left:4px solid #4CAF50; background:#f8f9fa;">
                     <div style="font-weight:bold; font-size:14px;">{intervention}</div>
                     <div style="color:#555; font-size:13px;">{reason}</div>
                 </div>
-                """, unsafe_allow_html=True)
+                """
+                for intervention, reason in get_recommendation_with_reasons(risk_value, student_data)
+            )
+            st.markdown(interventions_html, unsafe_allow_html=True)
     
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -564,13 +606,16 @@ def main():
     app_mode = render_sidebar()
     
     # Header
-    st.markdown("<h1 class='main-header'>Chronic Absenteeism Predictor</h1>", unsafe_allow_html=True)
-    st.markdown("<p class='sub-header'>Identify at-risk students and plan effective interventions</p>", unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # Render the selected section
     if app_mode == "System Training":
+        from utils.training_data import render_training_data_tab
+        from utils.model_params import render_model_params_tab
+        from utils.training_results import render_training_results_tab
+
         st.markdown("<div class='section-card'>", unsafe_allow_html=True)
-        st.markdown("<div class='icon-header'><span class='emoji'>🧠</span><h2>System Training</h2></div>", unsafe_allow_html=True)
+        st.markdown(_TRAINING_HEADER_HTML, unsafe_allow_html=True)
         st.markdown("""
         Train the prediction model using historical student data. The system will learn patterns 
         that lead to chronic absenteeism and use these to predict future risk.
@@ -591,15 +636,21 @@ def main():
         st.markdown("</div>", unsafe_allow_html=True)
             
     elif app_mode == "Batch Prediction":
+        from utils.batch_prediction import render_batch_prediction
+
         render_batch_prediction()
-        
+
         # Individual student prediction section
         render_individual_prediction()
-            
+
     elif app_mode == "Advanced Analytics":
+        from utils.advanced_analytics import render_advanced_analytics
+
         render_advanced_analytics()
-            
+
     elif app_mode == "System Settings":
+        from utils.system_settings import render_system_settings
+
         render_system_settings()
 
 # Run the application
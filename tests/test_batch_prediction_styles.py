@@ -0,0 +1,54 @@
+"""
+Tests for the batch prediction result stylers
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from utils.batch_prediction import (_category_colors, _risk_value_colors,
+                                    _RISK_COLORS, _DEFAULT_CELL)
+
+
+class CategoryColorsTest(unittest.TestCase):
+    def test_categorical_column_without_nans(self):
+        # Risk_Category is categorical after ingest downcasting; a clean
+        # High/Medium/Low column must style without raising
+        col = pd.Series(['High', 'Low', 'Medium'], dtype='category')
+        styles = _category_colors(col)
+        self.assertEqual(
+            styles.tolist(),
+            [_RISK_COLORS['High'], _RISK_COLORS['Low'], _RISK_COLORS['Medium']],
+        )
+
+    def test_unknown_category_gets_default_cell(self):
+        col = pd.Series(['High', 'Unknown'], dtype='category')
+        styles = _category_colors(col)
+        self.assertEqual(styles.tolist(), [_RISK_COLORS['High'], _DEFAULT_CELL])
+
+    def test_styler_renders_categorical_frame(self):
+        df = pd.DataFrame({
+            'Risk_Category': pd.Series(['High', 'Medium', 'Low'], dtype='category'),
+            'CA_Risk': np.array([0.9, 0.5, 0.1], dtype='float32'),
+        })
+        styled = df.style.apply(_category_colors, subset=['Risk_Category'])
+        styled = styled.apply(_risk_value_colors, subset=['CA_Risk'])
+        html = styled.to_html()
+        self.assertIn('#FFCCCC', html)
+        self.assertIn('#CCFFCC', html)
+
+
+class RiskValueColorsTest(unittest.TestCase):
+    def test_tiers_match_category_boundaries(self):
+        col = pd.Series([0.1, 0.3, 0.7, float('nan')])
+        styles = _risk_value_colors(col)
+        self.assertEqual(
+            styles.tolist(),
+            [_RISK_COLORS['Low'], _RISK_COLORS['Medium'],
+             _RISK_COLORS['High'], _DEFAULT_CELL],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,16 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-from utils.common import generate_system_report, plot_feature_importance
+from utils.common import generate_system_report, plot_feature_importance, has_data, display_svg
+
+# SVG scatter traces bog the browser down past a few thousand markers;
+# above this row count the plots switch to WebGL so rasterization happens
+# on the GPU instead of in the DOM
+_WEBGL_THRESHOLD = 1000
+
+def _scatter_mode(df):
+    """Pick the Plotly render mode for a per-row scatter over df"""
+    return 'webgl' if len(df) > _WEBGL_THRESHOLD else 'auto'
 
 def render_advanced_analytics():
     """Render the Advanced Analytics section"""
@@ -74,7 +83,7 @@ def render_advanced_analytics():
         # Feature correlation section
         st.markdown("### Feature Correlations")
         
-        if 'historical_data' in st.session_state and not st.session_state.historical_data.empty:
+        if has_data('historical_data'):
             # Compute correlations with target variable if available
             # Check for either CA_Status or CA_Label (for backwards compatibility)
             target_column = None
@@ -86,7 +95,7 @@ def render_advanced_analytics():
             if target_column is not None:
                 # Get numerical columns
                 numerical_cols = st.session_state.historical_data.select_dtypes(
-                    include=['int64', 'float64']
+                    include='number'
                 ).columns.tolist()
                 
                 # Remove target from feature list if present
@@ -152,10 +161,10 @@ def render_advanced_analytics():
         # Feature distribution analysis
         st.markdown("### Feature Distributions")
         
-        if 'historical_data' in st.session_state and not st.session_state.historical_data.empty:
+        if has_data('historical_data'):
             # Feature selector
             available_features = st.session_state.historical_data.select_dtypes(
-                include=['int64', 'float64']
+                include='number'
             ).columns.tolist()
             
             # Filter out certain columns
@@ -361,7 +370,7 @@ def render_advanced_analytics():
     with analytics_tabs[2]:
         st.markdown("<div class='card-title'>🏫 Risk Distribution by School</div>", unsafe_allow_html=True)
         
-        if 'historical_data' in st.session_state and not st.session_state.historical_data.empty:
+        if has_data('historical_data'):
             if 'School' in st.session_state.historical_data.columns:
                 # Check for risk column
                 risk_column = None
@@ -448,7 +457,7 @@ def render_advanced_analytics():
     with analytics_tabs[3]:
         st.markdown("<div class='card-title'>📚 Attendance vs Academic Performance</div>", unsafe_allow_html=True)
         
-        if 'historical_data' in st.session_state and not st.session_state.historical_data.empty:
+        if has_data('historical_data'):
             # Check for required columns
             attendance_col = None
             academic_col = None
@@ -489,7 +498,8 @@ def render_advanced_analytics():
                             academic_col: "Academic Performance",
                             risk_column: "CA Risk"
                         },
-                        height=500
+                        height=500,
+                        render_mode=_scatter_mode(st.session_state.historical_data)
                     )
                 else:
                     fig = px.scatter(
@@ -502,9 +512,10 @@ def render_advanced_analytics():
                             attendance_col: "Attendance",
                             academic_col: "Academic Performance"
                         },
-                        height=500
+                        height=500,
+                        render_mode=_scatter_mode(st.session_state.historical_data)
                     )
-                
+
                 fig.update_layout(
                     xaxis_title="Attendance",
                     yaxis_title="Academic Performance",
@@ -559,9 +570,10 @@ def render_advanced_analytics():
                         attendance_col: "Attendance",
                         academic_col: "Academic Performance"
                     },
-                    height=500
+                    height=500,
+                    render_mode=_scatter_mode(st.session_state.historical_data)
                 )
-                
+
                 # Add regression line
                 fig2.add_traces(
                     go.Scatter(
@@ -603,7 +615,7 @@ def render_advanced_analytics():
     with analytics_tabs[4]:
         st.markdown("<div class='card-title'>🔥 Risk Heatmap by Grade & SES</div>", unsafe_allow_html=True)
         
-        if 'historical_data' in st.session_state and not st.session_state.historical_data.empty:
+        if has_data('historical_data'):
             # Check for required columns
             if 'Grade' in st.session_state.historical_data.columns and 'Meal_Code' in st.session_state.historical_data.columns:
                 # Check for risk column
@@ -628,7 +640,7 @@ def render_advanced_analytics():
                             pivot_data[meal_code] = pd.NA
                     
                     # Sort grade levels numerically
-                    if pivot_data.index.dtype == 'int64' or pivot_data.index.dtype == 'float64':
+                    if pd.api.types.is_numeric_dtype(pivot_data.index):
                         pivot_data = pivot_data.sort_index()
                     
                     # Create heatmap
@@ -693,7 +705,7 @@ def render_advanced_analytics():
        
     # The rest of the existing temporal trends code (visualization, analysis, etc.)
         
-        if 'historical_data' in st.session_state and not st.session_state.historical_data.empty:
+        if has_data('historical_data'):
             # Check for 'Year' column
             if 'Year' in st.session_state.historical_data.columns:
                 # Check for attendance columns
@@ -824,7 +836,7 @@ def render_advanced_analytics():
     with analytics_tabs[6]:
         st.markdown("<div class='card-title'>👨‍👩‍👧‍👦 Cohort Analysis</div>", unsafe_allow_html=True)
         
-        if 'historical_data' in st.session_state and not st.session_state.historical_data.empty:
+        if has_data('historical_data'):
             # Check for demographic columns
             demographic_cols = []
             for col in ['Gender', 'Meal_Code', 'Grade']:
@@ -1178,8 +1190,8 @@ def render_advanced_analytics():
             with system_col1:
                 st.metric("Model Type", st.session_state.active_model.replace('_', ' ').title() if 'active_model' in st.session_state else 'Unknown')
                 
-                if 'historical_data' in st.session_state:
-                    st.metric("Training Data Size", len(st.session_state.historical_data))
+                hist = st.session_state.get('historical_data')
+                st.metric("Training Data Size", 0 if hist is None else len(hist))
             
             with system_col2:
                 if 'training_report' in st.session_state:
@@ -1233,21 +1245,3 @@ def render_advanced_analytics():
     st.markdown("</div>", unsafe_allow_html=True)
     return
 
-
-def display_svg(file_path, width=None):
-    """Display an SVG file in a Streamlit app"""
-    import os
-    
-    if not os.path.exists(file_path):
-        # Return a default placeholder if the file doesn't exist
-        return f"<div style='text-align: center; color: #888;'>Image not found: {file_path}</div>"
-        
-    with open(file_path, "r") as f:
-        content = f.read()
-        
-    if width:
-        # Add width attribute to the SVG tag
-        content = content.replace("<svg ", f"<svg width='{width}' ")
-   
-    return content
-
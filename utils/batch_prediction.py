@@ -5,12 +5,124 @@ Batch Prediction functionality
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from utils.common import upload_data_file, batch_predict_ca, predict_ca_risk, plot_risk_gauge, get_recommendation
+# Effectively free: Streamlit itself imports pyarrow at startup
+import pyarrow as pa
+from utils.common import upload_data_file, batch_predict_ca, predict_ca_risk, plot_risk_gauge, get_recommendation, has_data, display_svg, downcast_dataframe, next_data_version
+
+# Cell backgrounds per risk tier, shared by the category and score columns
+_RISK_COLORS = {
+    'High': 'background-color: #FFCCCC',    # Light red
+    'Medium': 'background-color: #FFFFCC',  # Light yellow
+    'Low': 'background-color: #CCFFCC',     # Light green
+}
+_DEFAULT_CELL = 'background-color: #FFFFFF'
+
+def _category_colors(col):
+    """Column-wise styler: one dict map instead of a Python call per cell
+
+    The object cast matters: Risk_Category is categorical after ingest
+    downcasting, and mapping a clean categorical returns a Categorical
+    whose fillna would reject _DEFAULT_CELL as a new category.
+    """
+    return col.astype(object).map(_RISK_COLORS).fillna(_DEFAULT_CELL)
+
+def _risk_value_colors(col):
+    """Color numeric risk scores by tier with a single vectorized cut"""
+    tiers = pd.cut(
+        pd.to_numeric(col, errors='coerce'),
+        [-np.inf, 0.3, 0.7, np.inf],
+        labels=['Low', 'Medium', 'High'],
+        right=False
+    )
+    return tiers.astype(object).map(_RISK_COLORS).fillna(_DEFAULT_CELL)
+
+@st.cache_data(show_spinner=False)
+def _risk_summary(counts):
+    """Summary table and pie figure for a (High, Medium, Low) count triple
+
+    Keyed on the three counts rather than the results frame, so filter
+    clicks and other reruns reuse the cached objects instead of
+    re-aggregating and rebuilding the figure for the same predictions.
+    """
+    # Deferred so the module import does not pay for plotly.express; the
+    # figure is only built on a summary cache miss anyway
+    import plotly.express as px
+
+    high, medium, low = counts
+    summary_df = pd.DataFrame({
+        'Risk Category': ['High', 'Medium', 'Low'],
+        'Count': [high, medium, low]
+    })
+    total = max(high + medium + low, 1)
+    summary_df['Percentage'] = (summary_df['Count'] / total * 100).round(1)
+
+    fig = px.pie(
+        summary_df,
+        values='Count',
+        names='Risk Category',
+        title='Risk Distribution',
+        color='Risk Category',
+        color_discrete_map={'High': 'red', 'Medium': 'gold', 'Low': 'green'}
+    )
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=30, b=10)
+    )
+    return summary_df, fig
+
+@st.cache_data(show_spinner=False)
+def _export_csv_bytes(_table, export_cols, export_risk, version):
+    """CSV payload for the selected columns and risk levels
+
+    Works straight off the Arrow twin of the results - the risk filter
+    and column selection run as pyarrow compute kernels with no pandas
+    round trip. The table itself is excluded from hashing; the cache is
+    keyed on the results version token plus the two filter tuples, so
+    re-clicking the export or download buttons serves the cached bytes.
+    """
+    import io
+    from pyarrow import compute as pc
+    from pyarrow import csv as pa_csv
+
+    table = _table
+    if export_risk:
+        risk_col = table.column('Risk_Category')
+        if pa.types.is_dictionary(risk_col.type):
+            risk_col = pc.cast(risk_col, risk_col.type.value_type)
+        mask = pc.is_in(risk_col, value_set=pa.array(export_risk))
+        table = table.filter(mask)
+    else:
+        # Nothing selected exports a header-only CSV, matching the old
+        # pandas isin([]) behavior; pc.is_in rejects an empty value set
+        table = table.slice(0, 0)
+    table = table.select(list(export_cols))
+
+    # Arrow's CSV writer cannot emit dictionary columns; decode the
+    # categoricals back to their value type first
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            table = table.set_column(
+                i, field.name, pc.cast(table.column(i), field.type.value_type))
+
+    buf = io.BytesIO()
+    pa_csv.write_csv(table, buf)
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False)
+def _school_filter_options(_df, version):
+    """Cache the school filter choices per results version"""
+    if 'School' in _df.columns:
+        return _df['School'].dropna().unique().tolist()
+    return []
 
 def render_batch_prediction():
-    """Render the Batch Prediction section"""
+    """Render the Batch Prediction section
+
+    Deliberately not a fragment: the current-year uploader and the
+    prediction button live here, and their reruns must re-execute the
+    sidebar status and the individual-prediction section, which a
+    fragment-scoped rerun would skip.
+    """
     st.markdown("<div class='section-card'>", unsafe_allow_html=True)
     st.markdown(display_svg("images/batch_prediction.svg", width="200px"), unsafe_allow_html=True)
     st.markdown("<h2>Batch Prediction</h2>", unsafe_allow_html=True)
@@ -54,9 +166,11 @@ def render_batch_prediction():
         current_data = upload_data_file(file_type="current")
         
         # If data is available, enable prediction
-        if 'current_year_data' in st.session_state and not st.session_state.current_year_data.empty:
+        if has_data('current_year_data'):
             st.markdown("### Data Preview")
-            st.dataframe(st.session_state.current_year_data.head(5), use_container_width=True)
+            # iloc slicing materializes just the preview rows for Arrow
+            # serialization; head() would shallow-copy through the same path
+            st.dataframe(st.session_state.current_year_data.iloc[:5], use_container_width=True)
             
             # Run prediction button
             if st.button("Generate Predictions", key="batch_predict_button"):
@@ -67,7 +181,22 @@ def render_batch_prediction():
                         predictions = batch_predict_ca(st.session_state.current_year_data, st.session_state.model)
                         
                         if predictions is not None and not predictions.empty:
+                            # Shrink the results the same way ingest does:
+                            # CA_Risk narrows to float32 and Risk_Category
+                            # becomes categorical, so every later isin,
+                            # value_counts and Styler pass touches fewer bytes
+                            predictions = downcast_dataframe(predictions)
                             st.session_state.prediction_results = predictions
+                            # Arrow twin built once per run: dictionary-
+                            # encoded, zero-copy slices, reused by the CSV
+                            # export instead of re-serializing pandas
+                            st.session_state.prediction_results_arrow = pa.Table.from_pandas(
+                                predictions, preserve_index=False)
+                            # Fresh token per run: the results tab knows its
+                            # cached aggregates are stale, and since tokens
+                            # are process-unique two sessions can never
+                            # collide inside the shared cache_data store
+                            st.session_state._results_version = next_data_version()
                             st.session_state.prediction_complete = True
                             st.success("✅ Predictions generated successfully! Go to Prediction Results tab to view.")
                         else:
@@ -79,34 +208,33 @@ def render_batch_prediction():
     with batch_tabs[1]:  # Prediction Results tab
         st.markdown("<div class='card-title'>📊 Prediction Results</div>", unsafe_allow_html=True)
         
-        # Check if predictions are available
-        if 'prediction_results' not in st.session_state or st.session_state.prediction_results is None:
+        # Check if predictions are available - one lookup serves both the
+        # notice and the visualization guard below
+        results = st.session_state.get('prediction_results')
+        if results is None:
             st.info("No prediction results available. Please upload data and run prediction first.")
             # Don't return here - we want to show the rest of the UI
-        
+
         # Display prediction results
         st.markdown("### CA Risk Predictions")
-        
+
         # Only proceed with visualization if results are available
-        if 'prediction_results' in st.session_state and st.session_state.prediction_results is not None:
-            # Get the prediction results
-            results = st.session_state.prediction_results
-            
-            # Display a summary of the results
-            high_risk_count = len(results[results['Risk_Category'] == 'High'])
-            medium_risk_count = len(results[results['Risk_Category'] == 'Medium'])
-            low_risk_count = len(results[results['Risk_Category'] == 'Low'])
-            
-            # Create a DataFrame for the summary
-            summary_df = pd.DataFrame({
-                'Risk Category': ['High', 'Medium', 'Low'],
-                'Count': [high_risk_count, medium_risk_count, low_risk_count]
-            })
-            
-            # Calculate percentages
-            total_students = len(results)
-            summary_df['Percentage'] = (summary_df['Count'] / total_students * 100).round(1)
-            
+        if results is not None:
+            # The value_counts scan only reruns when a new prediction run
+            # bumped _results_version; filter-only reruns reuse the stored
+            # triple, and _risk_summary serves the table and pie from it
+            version = st.session_state.get('_results_version', 0)
+            if st.session_state.get('_summary_version') != version:
+                st.session_state._summary_counts = tuple(
+                    int(c) for c in results['Risk_Category']
+                    .value_counts()
+                    .reindex(['High', 'Medium', 'Low'], fill_value=0)
+                )
+                st.session_state._summary_version = version
+            counts = st.session_state._summary_counts
+            high_risk_count, medium_risk_count, low_risk_count = counts
+            summary_df, fig = _risk_summary(counts)
+
             # Display metrics
             metrics_col1, metrics_col2, metrics_col3 = st.columns(3)
             
@@ -117,21 +245,6 @@ def render_batch_prediction():
             with metrics_col3:
                 st.metric("Low Risk Students", f"{low_risk_count} ({summary_df.iloc[2]['Percentage']}%)")
             
-            # Create a pie chart for risk distribution
-            fig = px.pie(
-                summary_df,
-                values='Count',
-                names='Risk Category',
-                title='Risk Distribution',
-                color='Risk Category',
-                color_discrete_map={'High': 'red', 'Medium': 'gold', 'Low': 'green'}
-            )
-            
-            fig.update_layout(
-                height=400,
-                margin=dict(l=20, r=20, t=30, b=10)
-            )
-            
             st.plotly_chart(fig, use_container_width=True)
             
             # Filter and search options
@@ -142,7 +255,7 @@ def render_batch_prediction():
             
             with filter_col1:
                 # School filter
-                available_schools = results['School'].unique().tolist() if 'School' in results.columns else []
+                available_schools = _school_filter_options(results, version)
                 selected_school = st.selectbox(
                     "School",
                     options=["All"] + available_schools,
@@ -165,17 +278,22 @@ def render_batch_prediction():
             
             # Define filters function
             def apply_filters(df):
-                filtered_df = df.copy()
-                
+                # Build one combined mask and slice once; .to_numpy()
+                # skips index alignment and nothing is copied up front
+                mask = np.ones(len(df), dtype=bool)
+
                 # Apply school filter
-                if selected_school != "All" and 'School' in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df['School'] == selected_school]
-                
+                if selected_school != "All" and 'School' in df.columns:
+                    mask &= df['School'].to_numpy() == selected_school
+
                 # Apply risk filter
                 if selected_risk:
-                    filtered_df = filtered_df[filtered_df['Risk_Category'].isin(selected_risk)]
-                
-                return filtered_df
+                    mask &= df['Risk_Category'].isin(selected_risk).to_numpy()
+
+                if mask.all():
+                    # No active filter - hand back the original frame
+                    return df
+                return df.loc[mask]
             
             # Handle reset button using callbacks for proper state management
             def reset_filters():
@@ -198,49 +316,24 @@ def render_batch_prediction():
                 # Submit button for the form
                 filter_submit = st.form_submit_button("Apply Filters")
             
-            # Add highlighting for risk levels - updated to use the recommended Styler.map method
-            def highlight_risk(val):
-                if pd.isna(val):
-                    return 'background-color: #FFFFFF'  # White for missing data
-                
-                if isinstance(val, str):
-                    if val == 'High':
-                        return 'background-color: #FFCCCC'  # Light red
-                    elif val == 'Medium':
-                        return 'background-color: #FFFFCC'  # Light yellow
-                    elif val == 'Low':
-                        return 'background-color: #CCFFCC'  # Light green
-                    
-                # Try to convert numeric values
-                try:
-                    val_float = float(val)
-                    if val_float >= 0.7:
-                        return 'background-color: #FFCCCC'  # Light red
-                    elif val_float >= 0.3:
-                        return 'background-color: #FFFFCC'  # Light yellow
-                    else:
-                        return 'background-color: #CCFFCC'  # Light green
-                except (ValueError, TypeError):
-                    pass
-                
-                return 'background-color: #FFFFFF'  # Default white
-            
             # Select columns to display
-            display_cols = ['Student_ID', 'School', 'Grade', 'Gender', 'CA_Risk', 'Risk_Category']
+            display_cols = ['Student_ID', 'School', 'Grade', 'Gender', 'CA_Risk',
+                            'Risk_Category', 'Recommended_Actions']
             display_cols = [col for col in display_cols if col in filtered_results.columns]
             
             # Create a dataframe for display
             display_df = filtered_results[display_cols].copy()
             
-            # Apply highlighting using the newer pandas Styler.map method (replacing deprecated applymap)
-            styled_results = display_df.style.map(
-                highlight_risk, subset=['Risk_Category']
+            # Column-wise Styler.apply with vectorized color lookups; the
+            # old per-cell Styler.map cost two Python calls per row
+            styled_results = display_df.style.apply(
+                _category_colors, subset=['Risk_Category']
             )
-            
+
             # Also highlight the risk value column
             if 'CA_Risk' in display_df.columns:
-                styled_results = styled_results.map(
-                    highlight_risk, subset=['CA_Risk']
+                styled_results = styled_results.apply(
+                    _risk_value_colors, subset=['CA_Risk']
                 )
             
             # Display the table
@@ -257,7 +350,8 @@ def render_batch_prediction():
                 export_cols = st.multiselect(
                     "Columns to Export",
                     options=results.columns.tolist(),
-                    default=['Student_ID', 'School', 'Grade', 'Gender', 'CA_Risk', 'Risk_Category'],
+                    default=['Student_ID', 'School', 'Grade', 'Gender', 'CA_Risk',
+                             'Risk_Category', 'Recommended_Actions'],
                     key="export_columns"
                 )
             
@@ -296,15 +390,15 @@ def render_batch_prediction():
                 if not export_cols:
                     st.warning("Please select at least one column to export.")
                 else:
-                    # Filter by selected risk levels
-                    export_data = results[results['Risk_Category'].isin(export_risk)]
-                    
-                    # Select columns
-                    export_data = export_data[export_cols]
-                    
-                    # Convert to CSV
-                    csv = export_data.to_csv(index=False)
-                    
+                    # Build (or fetch from cache) the CSV bytes from the
+                    # Arrow twin; older sessions may predate it
+                    arrow_results = st.session_state.get('prediction_results_arrow')
+                    if arrow_results is None:
+                        arrow_results = pa.Table.from_pandas(results, preserve_index=False)
+                        st.session_state.prediction_results_arrow = arrow_results
+                    csv = _export_csv_bytes(arrow_results, tuple(export_cols),
+                                            tuple(export_risk), version)
+
                     # Create a download link
                     st.download_button(
                         label="Download CSV",
@@ -315,21 +409,3 @@ def render_batch_prediction():
     
     st.markdown("</div>", unsafe_allow_html=True)
     return
-
-
-def display_svg(file_path, width=None):
-    """Display an SVG file in a Streamlit app"""
-    import os
-    
-    if not os.path.exists(file_path):
-        # Return a default placeholder if the file doesn't exist
-        return f"<div style='text-align: center; color: #888;'>Image not found: {file_path}</div>"
-        
-    with open(file_path, "r") as f:
-        content = f.read()
-        
-    if width:
-        # Add width attribute to the SVG tag
-        content = content.replace("<svg ", f"<svg width='{width}' ")
-        
-    return content
@@ -2,11 +2,10 @@
 Common utilities shared across different modules
 """
 
+import itertools
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.neural_network import MLPClassifier
@@ -18,21 +17,33 @@ import os
 import base64
 from datetime import datetime
 
-def display_svg(file_path, width=None):
-    """Display an SVG file in a Streamlit app"""
-    if not os.path.exists(file_path):
-        # Return a default placeholder if the file doesn't exist
-        return f"<div style='text-align: center; color: #888;'>Image not found: {file_path}</div>"
-        
+@st.cache_data(show_spinner=False)
+def _read_svg(file_path, width, mtime):
+    """Read and width-adjust an SVG; mtime in the key handles asset edits"""
     with open(file_path, "r") as f:
         content = f.read()
-        
+
     if width:
         # Add width attribute to the SVG tag
         content = content.replace("<svg ", f"<svg width='{width}' ")
-        
+
     return content
 
+def display_svg(file_path, width=None):
+    """Display an SVG file in a Streamlit app
+
+    The file is read once per (path, width, mtime) and served from cache
+    on warm reruns, so section banners stop costing disk I/O on every
+    interaction.
+    """
+    try:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        # Return a default placeholder if the file doesn't exist
+        return f"<div style='text-align: center; color: #888;'>Image not found: {file_path}</div>"
+
+    return _read_svg(file_path, width, mtime)
+
 def generate_sample_data():
     """Generate sample data with specific attendance patterns including 15-25% attendance group"""
     np.random.seed(42)  # For reproducibility
@@ -157,13 +168,51 @@ def generate_sample_data():
     combined_data = pd.concat([data, historical_df])
     
     return data, combined_data
+def compute_risk_scores(present_days, absent_days, academic_performance):
+    """Compute the attendance/academic risk formula for scalars or arrays
+
+    Vectorized with numpy so batch callers can score whole columns in one
+    call without per-student Python overhead; single values go through the
+    same expression and come back as a plain float.
+    """
+    present = np.asarray(present_days, dtype=float)
+    absent = np.asarray(absent_days, dtype=float)
+    academic = np.asarray(academic_performance, dtype=float)
+
+    total = present + absent
+    attendance_rate = np.divide(present, total, out=np.zeros_like(total), where=total > 0)
+    risk = 0.6 * (1 - attendance_rate) + 0.4 * (1 - academic / 100)
+
+    if risk.ndim == 0:
+        return float(risk)
+    return risk
+
+def add_derived_columns(df):
+    """Add derived columns used by risk explanations in one vectorized pass
+
+    Computes Attendance_Rate for the whole DataFrame with a single eval
+    expression so per-student callers can read the precomputed value instead
+    of redoing the division in Python for every row. Frames that already
+    carry the column pass through untouched - after ingest the day columns
+    may be downcast too narrow for their sum.
+    """
+    if ('Attendance_Rate' not in df.columns
+            and 'Present_Days' in df.columns and 'Absent_Days' in df.columns):
+        df = df.eval("Attendance_Rate = Present_Days / (Present_Days + Absent_Days) * 100")
+        # Zero recorded days (new enrollees) divides 0/0; treat that as
+        # 0.0 like compute_risk_scores so no NaN reaches training or the
+        # risk explanations
+        df['Attendance_Rate'] = df['Attendance_Rate'].fillna(0.0)
+    return df
+
 def preprocess_data(df, is_training=True):
     """Preprocess the input data for training or prediction"""
     try:
         processed_df = df.copy()
         
         # Handle missing values
-        numerical_cols = ['Present_Days', 'Absent_Days', 'Attendance_Percentage', 'Academic_Performance']
+        numerical_cols = ['Present_Days', 'Absent_Days', 'Attendance_Percentage',
+                          'Attendance_Rate', 'Academic_Performance']
         for col in numerical_cols:
             if col in processed_df.columns:
                 processed_df[col] = processed_df[col].fillna(processed_df[col].median())
@@ -225,8 +274,9 @@ def train_models(df, models_to_train=['random_forest'], params=None):
         X_train_scaled = X_train.copy()
         X_test_scaled = X_test.copy()
         
-        # Scale only numerical columns
-        numerical_cols = X_train.select_dtypes(include=['int64', 'float64']).columns
+        # Scale only numerical columns; 'number' matches the narrowed
+        # dtypes produced by downcast_dataframe as well as the defaults
+        numerical_cols = X_train.select_dtypes(include='number').columns
         X_train_scaled[numerical_cols] = scaler.fit_transform(X_train[numerical_cols])
         X_test_scaled[numerical_cols] = scaler.transform(X_test[numerical_cols])
         
@@ -346,7 +396,12 @@ def predict_ca_risk(input_data, model):
             input_df = pd.DataFrame([input_data])
         else:
             input_df = input_data.copy()
-        
+
+        # Dict inputs from the individual form lack Attendance_Rate;
+        # derive it here so every prediction path sees the same feature
+        # set as the ingested training data instead of a zero fill
+        input_df = add_derived_columns(input_df)
+
         # Check if model is available
         if model is None:
             st.error("No trained model available. Please train a model first.")
@@ -452,38 +507,17 @@ def predict_ca_risk(input_data, model):
         st.error(f"Error in prediction pre-processing: {str(e)}")
         return None
 
-def plot_risk_gauge(risk_value, key=None):
-    """Create a gauge chart for risk visualization"""
-    if risk_value is None:
-        return None
-    
-    # Convert to scalar if it's an array (handles both single and batch predictions)
-    if hasattr(risk_value, '__len__') and len(risk_value) > 0 and not isinstance(risk_value, (str, dict)):
-        risk_value = float(risk_value[0])
-    
-    # Make sure risk_value is a valid float
-    try:
-        risk_value_float = float(risk_value)
-    except (ValueError, TypeError):
-        st.error(f"Invalid risk value: {risk_value} cannot be converted to float")
-        return None
-        
-    # Determine gauge color based on risk level
-    if risk_value_float < 0.3:
-        color = "green"
-    elif risk_value_float < 0.7:
-        color = "gold"
-    else:
-        color = "red"
-    
-    # Create the gauge chart
+def _build_gauge_template():
+    """Construct the invariant parts of the risk gauge once per process"""
+    import plotly.graph_objects as go
+
     fig = go.Figure(go.Indicator(
         mode = "gauge+number",
-        value = risk_value_float * 100,  # Convert to percentage
+        value = 0,
         title = {'text': "CA Risk Level"},
         gauge = {
             'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
-            'bar': {'color': color},
+            'bar': {'color': "green"},
             'bgcolor': "white",
             'borderwidth': 2,
             'bordercolor': "gray",
@@ -494,15 +528,73 @@ def plot_risk_gauge(risk_value, key=None):
             ],
         }
     ))
-    
-    # Update layout
     fig.update_layout(
         height=250,
         margin=dict(l=20, r=20, t=30, b=10),
     )
-    
     return fig
 
+_GAUGE_TEMPLATE = None
+
+def _gauge_template():
+    """Build the template on first use, not at import
+
+    Keeps plotly out of the utils.common import path so modes that never
+    render a gauge do not pay for it on cold start.
+    """
+    global _GAUGE_TEMPLATE
+    if _GAUGE_TEMPLATE is None:
+        _GAUGE_TEMPLATE = _build_gauge_template()
+    return _GAUGE_TEMPLATE
+
+def plot_risk_gauge(risk_value, key=None):
+    """Create a gauge chart for risk visualization
+
+    Clones the module-level template and retouches only the value and bar
+    color, rather than revalidating the full axis/steps spec per call.
+    go.Figure(template) copies; copy.copy would share the nested layout
+    objects between figures.
+    """
+    if risk_value is None:
+        return None
+
+    # Convert to scalar if it's an array (handles both single and batch predictions)
+    if hasattr(risk_value, '__len__') and len(risk_value) > 0 and not isinstance(risk_value, (str, dict)):
+        risk_value = float(risk_value[0])
+
+    # Make sure risk_value is a valid float
+    try:
+        risk_value_float = float(risk_value)
+    except (ValueError, TypeError):
+        st.error(f"Invalid risk value: {risk_value} cannot be converted to float")
+        return None
+
+    # Determine gauge color based on risk level
+    if risk_value_float < 0.3:
+        color = "green"
+    elif risk_value_float < 0.7:
+        color = "gold"
+    else:
+        color = "red"
+
+    import plotly.graph_objects as go
+
+    fig = go.Figure(_gauge_template())
+    fig.data[0].value = risk_value_float * 100  # Convert to percentage
+    fig.data[0].gauge.bar.color = color
+
+    return fig
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def cached_risk_gauge(bucket):
+    """Gauge figure memoized per two-decimal risk bucket
+
+    Callers round the risk value to two decimals before passing it in, so
+    the figure is built and serialized at most once per visually distinct
+    gauge state instead of on every rerun.
+    """
+    return plot_risk_gauge(bucket)
+
 def plot_feature_importance(model, key=None):
     """Create interactive feature importance visualization"""
     if not model or not hasattr(model, 'feature_importances_'):
@@ -523,8 +615,10 @@ def plot_feature_importance(model, key=None):
     
     # Select top features
     top_features = importance_df.head(10)
-    
+
     # Create the bar chart
+    import plotly.express as px
+
     fig = px.bar(
         top_features,
         x='Importance',
@@ -546,18 +640,23 @@ def plot_feature_importance(model, key=None):
 
 def plot_student_history(student_id):
     """Plot historical trends for a student"""
-    if 'historical_data' not in st.session_state or st.session_state.historical_data.empty:
+    if not has_data('historical_data'):
         return None
-        
-    # Filter data for the specific student
-    student_data = st.session_state.historical_data[st.session_state.historical_data['Student_ID'] == student_id].copy()
+
+    # Filter data for the specific student; the categorical Student_ID
+    # makes this an integer-code compare
+    historical = st.session_state.historical_data
+    student_data = historical[historical['Student_ID'] == student_id].copy()
     
     if student_data.empty:
         return None
     
     # Sort by Year
     student_data = student_data.sort_values('Year')
-    
+
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     # Create risk trend
     risk_fig = px.line(
         student_data,
@@ -691,7 +790,7 @@ def on_student_id_change():
         st.session_state.calculation_complete = False
     
     # If we have historical data, attempt to load the student's data into the form
-    if 'historical_data' in st.session_state and not st.session_state.historical_data.empty:
+    if has_data('historical_data'):
         student_id = st.session_state.student_id_input
         
         # Safety check - ensure we have a string student ID
@@ -701,9 +800,8 @@ def on_student_id_change():
                 
         # Filter for the student's latest record - with safety check
         if 'Student_ID' in st.session_state.historical_data.columns:
-            student_data = st.session_state.historical_data[
-                st.session_state.historical_data['Student_ID'] == student_id
-            ]
+            historical = st.session_state.historical_data
+            student_data = historical[historical['Student_ID'] == student_id]
         else:
             # No Student_ID column, can't filter
             print("Warning: No Student_ID column in historical data")
@@ -811,6 +909,148 @@ def on_calculate_what_if():
     else:
         st.error("Error in what-if prediction. Please check inputs and model.")
 
+def _column_or_default(df, name, default=0):
+    """Fetch a column as a numpy array, or a filled default when absent"""
+    if name in df.columns:
+        return df[name].to_numpy()
+    return np.full(len(df), default)
+
+def batch_risk_explanations(df):
+    """Vectorized risk explanations over a scored results frame
+
+    Returns a Series of newline-joined explanation blocks aligned with
+    df's index. Every branch of the per-student explanation runs here as a
+    whole-column operation - np.select for the headline, np.where for the
+    optional factor lines - instead of one dict-at-a-time call per row.
+    """
+    risk = _column_or_default(df, 'CA_Risk').astype(float)
+    headline = np.select(
+        [risk >= 0.7, risk >= 0.4],
+        ["🚨 **Critical Risk Level** (70%+ probability of chronic absenteeism)",
+         "⚠️ **Elevated Risk Level** (40-69% probability)"],
+        default="✅ **Low Risk Level** (Good attendance patterns)"
+    )
+
+    # Prefer the precomputed column from add_derived_columns when available
+    if 'Attendance_Rate' in df.columns:
+        attendance_pct = df['Attendance_Rate'].to_numpy(dtype=float)
+    else:
+        present = _column_or_default(df, 'Present_Days').astype(float)
+        absent = _column_or_default(df, 'Absent_Days', 1).astype(float)
+        total = present + absent
+        attendance_pct = np.divide(present, total,
+                                   out=np.zeros_like(total), where=total > 0) * 100
+
+    academic = _column_or_default(df, 'Academic_Performance', 100)
+    if 'Meal_Code' in df.columns:
+        meal = df['Meal_Code'].astype(str).to_numpy()
+    else:
+        meal = np.full(len(df), '')
+
+    # astype(object) before concatenating: fixed-width unicode arrays do
+    # not support + with str literals, object arrays do
+    att_txt = np.where(
+        attendance_pct < 85,
+        "\n• Low attendance rate (" + np.char.mod("%.1f", attendance_pct).astype(object) + "%)",
+        ""
+    )
+    acad_txt = np.where(
+        np.asarray(academic, dtype=float) < 65,
+        "\n• Below-average academics (" + np.char.mod("%g", academic).astype(object) + "%)",
+        ""
+    )
+    meal_txt = np.where(
+        np.isin(meal, ('Free', 'Reduced')),
+        "\n• Eligible for meal assistance (potential socioeconomic factors)",
+        ""
+    )
+
+    blocks = (headline.astype(object) + att_txt.astype(object)
+              + acad_txt.astype(object) + meal_txt.astype(object))
+    return pd.Series(blocks, index=df.index)
+
+def _build_intervention_table():
+    """Precompile the recommendation decision tree into a flat lookup table
+
+    Enumerates every combination of risk tier (high/medium/low) and the
+    four feature gates (high absences, low academics, meal assistance, low
+    present days) - 3 x 16 = 48 cells, each holding a tuple of
+    (intervention, reason) pairs. Batch scoring then reduces to encoding an
+    integer key per row and fancy-indexing this array instead of walking
+    the Python if/elif ladder per student. Reasons are tier-level text; the
+    per-student numbers that the individual-path recommendations
+    interpolate are intentionally dropped so entries can be shared.
+    """
+    table = np.empty(3 * 16, dtype=object)
+    for tier in range(3):
+        for bits in range(16):
+            high_absent = bool(bits & 1)
+            low_academic = bool(bits & 2)
+            meal_assist = bool(bits & 4)
+            low_present = bool(bits & 8)
+
+            recs = []
+            if tier == 0:  # High risk
+                recs.append((
+                    "🚨 Immediate 1-on-1 meeting with school counselor",
+                    "Student is at very high risk of chronic absenteeism"
+                ))
+                recs.append((
+                    "📞 Parent/guardian conference within 48 hours",
+                    "Early family engagement is critical"
+                ))
+                if high_absent:
+                    recs.append(("🩺 Schedule health checkup", "High absence days"))
+                if low_academic:
+                    recs.append(("📚 Assign academic support tutor", "Low academic performance"))
+            elif tier == 1:  # Medium risk
+                recs.append((
+                    "📅 Weekly check-ins with homeroom teacher",
+                    "Regular monitoring prevents escalation"
+                ))
+                recs.append((
+                    "✉️ Send personalized attendance report",
+                    "Family awareness improves outcomes"
+                ))
+                if meal_assist:
+                    recs.append(("🍎 Connect with nutrition programs", "Address potential food insecurity"))
+            else:  # Low risk
+                recs.append(("👍 Positive reinforcement", "Maintaining good patterns prevents issues"))
+                if low_present:
+                    recs.append(("🎯 Set attendance improvement goal", "Below the attendance target"))
+
+            table[tier * 16 + bits] = tuple(recs)
+    return table
+
+_INTERVENTION_TABLE = _build_intervention_table()
+
+# Display form of each cell, joined once at import so batch scoring
+# fancy-indexes finished strings instead of joining tuples per row
+_INTERVENTION_TEXT = np.array(
+    ['; '.join(f"{action} ({reason})" for action, reason in cell)
+     for cell in _INTERVENTION_TABLE],
+    dtype=object,
+)
+
+def recommendations_from_table(df, risk):
+    """Recommended actions for every row via the decision table
+
+    Encodes each row into an integer key and fancy-indexes the precompiled
+    48-cell table - branchless, so large batches avoid per-student Python
+    branching entirely. Returns a Series of joined 'action (reason)'
+    strings aligned with df's index, ready for the results table and the
+    CSV export.
+    """
+    risk = np.asarray(risk, dtype=float)
+    tier = np.select([risk >= 0.7, risk >= 0.3], [0, 1], default=2)
+
+    key = tier * 16
+    key += (_column_or_default(df, 'Absent_Days') > 15).astype(int)
+    key += (_column_or_default(df, 'Academic_Performance', 70) < 60).astype(int) * 2
+    key += np.isin(_column_or_default(df, 'Meal_Code', ''), ['Free', 'Reduced']).astype(int) * 4
+    key += (_column_or_default(df, 'Present_Days') < 160).astype(int) * 8
+    return pd.Series(_INTERVENTION_TEXT[key], index=df.index)
+
 def batch_predict_ca(df, model):
     """Run predictions for multiple students"""
     try:
@@ -826,36 +1066,26 @@ def batch_predict_ca(df, model):
         risk_values = predict_ca_risk(result_df, model)
         
         if risk_values is not None:
-            # Add risk predictions to the dataframe - ensure it's in the right format
-            # Convert to list if it's a numpy array to avoid ambiguity in truth value comparisons
-            if hasattr(risk_values, 'tolist'):
-                risk_values_list = risk_values.tolist()
-            else:
-                risk_values_list = risk_values if isinstance(risk_values, list) else [risk_values]
-                
-            # Add the risk values to the dataframe
-            result_df['CA_Risk'] = risk_values_list
-            
-            # Add risk category based on risk level
-            risk_categories = ["Low", "Medium", "High"]
-            risk_thresholds = [0.3, 0.7]
-            
-            # Helper function to categorize each risk value
-            def categorize_risk(value):
-                try:
-                    value_float = float(value)
-                    if value_float < 0.3:
-                        return "Low"
-                    elif value_float < 0.7:
-                        return "Medium"
-                    else:
-                        return "High"
-                except (ValueError, TypeError):
-                    return "Unknown"
-            
-            # Apply the categorization function to each risk value
-            result_df['Risk_Category'] = result_df['CA_Risk'].apply(categorize_risk)
-            
+            # predict_ca_risk already scores the whole frame in one
+            # model call; a list or scalar assigns/broadcasts directly
+            result_df['CA_Risk'] = risk_values
+
+            # Categorize every score in one vectorized pass instead of a
+            # per-row apply; non-numeric scores coerce to NaN -> Unknown
+            risk = pd.to_numeric(result_df['CA_Risk'], errors='coerce').to_numpy(dtype=float)
+            result_df['Risk_Category'] = np.select(
+                [np.isnan(risk), risk < 0.3, risk < 0.7],
+                ['Unknown', 'Low', 'Medium'],
+                default='High'
+            )
+
+            # Batch counterparts of the individual explanation and
+            # recommendation helpers run here as whole-column passes, so
+            # the results table and CSV export carry per-student context
+            # without a Python loop
+            result_df['Risk_Explanation'] = batch_risk_explanations(result_df)
+            result_df['Recommended_Actions'] = recommendations_from_table(result_df, risk)
+
             return result_df
         else:
             return None
@@ -863,6 +1093,130 @@ def batch_predict_ca(df, model):
         st.error(f"Error in batch prediction: {str(e)}")
         return None
 
+def downcast_dataframe(df):
+    """Shrink a freshly loaded DataFrame to the narrowest safe dtypes
+
+    Integer and float columns are compared column-wise against
+    np.iinfo/np.finfo bounds and narrowed with a single bulk astype, and
+    the low-cardinality string columns used across the app (School, Gender,
+    Meal_Code) become categoricals. Typically 60-80% smaller, which speeds
+    up every later scan proportionally since those are memory-bound.
+    """
+    int_cols = df.select_dtypes(include='integer').columns
+    if len(int_cols):
+        bounds = df[int_cols].agg(['min', 'max'])
+        casts = {}
+        for col in int_cols:
+            for dtype in (np.int8, np.int16, np.int32):
+                info = np.iinfo(dtype)
+                if bounds.at['min', col] >= info.min and bounds.at['max', col] <= info.max:
+                    casts[col] = dtype
+                    break
+        if casts:
+            df = df.astype(casts)
+
+    float_cols = df.select_dtypes(include='float').columns
+    if len(float_cols):
+        f32 = np.finfo(np.float32)
+        casts = {
+            col: np.float32 for col in float_cols
+            if df[col].abs().max() <= f32.max or df[col].isna().all()
+        }
+        if casts:
+            df = df.astype(casts)
+
+    for col in ('School', 'Gender', 'Meal_Code', 'Risk_Category'):
+        if col in df.columns and df[col].dtype == object:
+            df[col] = df[col].astype('category')
+
+    return df
+
+def align_shared_categories():
+    """Unify category dtypes between the historical and current-year frames
+
+    When both frames are loaded, their categorical string columns get one
+    shared CategoricalDtype (union of categories, sorted). Downstream
+    featurization and comparisons then work directly on the integer codes
+    without a re-encoding pass, and concat keeps the columns categorical.
+    """
+    hist = st.session_state.get('historical_data')
+    curr = st.session_state.get('current_year_data')
+    if hist is None or curr is None:
+        return
+
+    # Student_ID stays per-frame: its categories double as the roster list
+    for col in ('School', 'Gender', 'Meal_Code'):
+        if col not in hist.columns or col not in curr.columns:
+            continue
+        h, c = hist[col], curr[col]
+        if not (isinstance(h.dtype, pd.CategoricalDtype)
+                and isinstance(c.dtype, pd.CategoricalDtype)):
+            continue
+        if h.dtype == c.dtype:
+            continue
+        shared = pd.CategoricalDtype(sorted(set(h.cat.categories) | set(c.cat.categories)))
+        hist[col] = h.astype(shared)
+        curr[col] = c.astype(shared)
+
+# Monotonic source for data-snapshot cache keys. Keying caches on id(df)
+# is unsafe: cache_data is process-global and addresses get reused after
+# garbage collection, so a new upload can silently hit an old entry. A
+# counter token never collides across uploads or sessions.
+_data_version_counter = itertools.count(1)
+
+def next_data_version():
+    """Hand out a process-unique token identifying one data snapshot"""
+    return next(_data_version_counter)
+
+def has_data(key):
+    """True if the session holds a non-empty DataFrame under key
+
+    The "not loaded" sentinel is None rather than an empty DataFrame, so
+    sessions that never upload anything skip the BlockManager allocation
+    entirely; this helper keeps the None/empty distinction out of the
+    render modules.
+    """
+    df = st.session_state.get(key)
+    return df is not None and not df.empty
+
+def update_data_status():
+    """Refresh the cached record counts read by the sidebar
+
+    Called after any data mutation (upload, sample load, reset) so the
+    sidebar can display plain ints instead of touching the DataFrames on
+    every rerun.
+    """
+    hist = st.session_state.get('historical_data')
+    curr = st.session_state.get('current_year_data')
+    st.session_state._data_status = {
+        'hist_n': 0 if hist is None else len(hist),
+        'curr_n': 0 if curr is None else len(curr),
+    }
+    # New token per mutation: caches keyed on it can never serve a stale
+    # snapshot, and tokens are unique across sessions
+    st.session_state._data_version = next_data_version()
+
+@st.cache_resource(show_spinner=False)
+def get_model_container():
+    """Process-wide container for the trained model
+
+    cache_resource hands back the same dict on every call, so the model
+    lives once per process and is accessed by reference rather than
+    being copied through the caching layer. New sessions are seeded from
+    it in initialize_session_state, so a model trained in one session is
+    available without retraining.
+    """
+    return {'model': None}
+
+def set_trained_model(model):
+    """Store (or clear with None) the trained model
+
+    Writes both the shared container and the session mirror so existing
+    st.session_state.model readers keep working unchanged.
+    """
+    get_model_container()['model'] = model
+    st.session_state.model = model
+
 def upload_data_file(file_type="current"):
     """Handle data file uploads
     
@@ -879,7 +1233,12 @@ def upload_data_file(file_type="current"):
         if uploaded_file is not None:
             # Read the file
             df = pd.read_csv(uploaded_file)
-            
+
+            # Store Student_ID as categorical so unique() and equality masks
+            # work on integer category codes instead of Python objects
+            if 'Student_ID' in df.columns:
+                df['Student_ID'] = df['Student_ID'].astype('category')
+
             # Basic validation - Student_ID is now optional
             required_cols = []
             if file_type == "historical":
@@ -894,7 +1253,14 @@ def upload_data_file(file_type="current"):
             if 'CA_Status' in df.columns and df['CA_Status'].dtype == 'object':
                 # Convert 'CA'/'NO_CA' to 1/0 if needed
                 df['CA_Status'] = df['CA_Status'].apply(lambda x: 1 if x == 'CA' else 0 if x == 'NO_CA' else x)
-            
+
+            # Derive Attendance_Rate before downcasting: eval runs on the
+            # wide int columns and the new float narrows with the rest
+            df = add_derived_columns(df)
+
+            # Shrink dtypes once at ingest so every downstream scan is cheaper
+            df = downcast_dataframe(df)
+
             # Set to session state
             if file_type == "current":
                 st.session_state.current_year_data = df
@@ -902,20 +1268,31 @@ def upload_data_file(file_type="current"):
             else:
                 st.session_state.historical_data = df
                 st.success(f"✅ Successfully loaded {len(df)} historical student records.")
-            
+
+            align_shared_categories()
+            update_data_status()
             return df
         
         # Option to use sample data
         if st.button(f"Use Sample {file_type.title()} Data", key=f"sample_{file_type}_data"):
             current_data, historical_data = generate_sample_data()
-            
+
+            # Same ingest treatment as uploaded CSVs so the two paths
+            # exercise identical dtypes and columns downstream
+            current_data = downcast_dataframe(add_derived_columns(current_data))
+            historical_data = downcast_dataframe(add_derived_columns(historical_data))
+
             if file_type == "current":
                 st.session_state.current_year_data = current_data
                 st.success(f"✅ Successfully loaded {len(current_data)} sample current year records.")
+                align_shared_categories()
+                update_data_status()
                 return current_data
             else:
                 st.session_state.historical_data = historical_data
                 st.success(f"✅ Successfully loaded {len(historical_data)} sample historical records.")
+                align_shared_categories()
+                update_data_status()
                 return historical_data
         
         return None
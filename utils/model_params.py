@@ -3,7 +3,7 @@ Model Parameters tab functionality
 """
 
 import streamlit as st
-from utils.common import train_models
+from utils.common import train_models, set_trained_model, has_data
 
 def render_model_params_tab():
     """Render the Model Parameters tab content"""
@@ -110,7 +110,7 @@ def render_model_params_tab():
     # Handle training process if button is clicked
     if train_button:
         # Check if we have training data
-        if 'historical_data' not in st.session_state or st.session_state.historical_data.empty:
+        if not has_data('historical_data'):
             st.error("❌ No training data available. Please upload data in the Training Data tab.")
             return
         
@@ -153,7 +153,7 @@ def render_model_params_tab():
         
         if training_results and 'models' in training_results and model_type_key in training_results['models']:
             # Store the model and related information in the session state
-            st.session_state.model = training_results['models'][model_type_key]
+            set_trained_model(training_results['models'][model_type_key])
             st.session_state.feature_names = training_results['feature_names']
             st.session_state.training_report = training_results['reports'][model_type_key]
             
@@ -4,7 +4,7 @@ System Settings functionality
 
 import streamlit as st
 import os
-import pandas as pd
+from utils.common import update_data_status, set_trained_model, has_data
 
 def render_system_settings():
     """Render the System Settings section"""
@@ -80,12 +80,12 @@ def render_system_settings():
         st.markdown("### Data Storage")
         
         # Display info on current data
-        if 'historical_data' in st.session_state and not st.session_state.historical_data.empty:
+        if has_data('historical_data'):
             st.metric("Training Data Records", len(st.session_state.historical_data))
         else:
             st.metric("Training Data Records", 0)
             
-        if 'current_year_data' in st.session_state and not st.session_state.current_year_data.empty:
+        if has_data('current_year_data'):
             st.metric("Current Year Records", len(st.session_state.current_year_data))
         else:
             st.metric("Current Year Records", 0)
@@ -107,8 +107,9 @@ def render_system_settings():
         
         with clear_col1:
             if st.button("Clear Training Data", key="clear_historical_data"):
-                if 'historical_data' in st.session_state:
-                    st.session_state.historical_data = pd.DataFrame()
+                if has_data('historical_data'):
+                    st.session_state.historical_data = None
+                    update_data_status()
                     st.success("✅ Training data cleared successfully!")
                     st.experimental_rerun()
                 else:
@@ -116,8 +117,9 @@ def render_system_settings():
         
         with clear_col2:
             if st.button("Clear Current Year Data", key="clear_current_data"):
-                if 'current_year_data' in st.session_state:
-                    st.session_state.current_year_data = pd.DataFrame()
+                if has_data('current_year_data'):
+                    st.session_state.current_year_data = None
+                    update_data_status()
                     st.success("✅ Current year data cleared successfully!")
                     st.experimental_rerun()
                 else:
@@ -126,7 +128,7 @@ def render_system_settings():
         with clear_col3:
             if st.button("Clear Trained Model", key="clear_model"):
                 if 'model' in st.session_state and st.session_state.model is not None:
-                    st.session_state.model = None
+                    set_trained_model(None)
                     st.session_state.training_report = None
                     st.success("✅ Trained model cleared successfully!")
                     st.experimental_rerun()
@@ -150,14 +152,16 @@ def render_system_settings():
             with confirm_col1:
                 if st.button("Yes, Reset Everything", key="confirm_reset_button"):
                     # Clear all session state data
-                    for key in ['historical_data', 'current_year_data', 'model', 
-                                'training_report', 'prediction_results', 'feature_names']:
+                    # None is the uniform "nothing loaded" sentinel for
+                    # DataFrames and models alike
+                    for key in ['historical_data', 'current_year_data', 'model',
+                                'training_report', 'prediction_results',
+                                'prediction_results_arrow', 'feature_names']:
                         if key in st.session_state:
-                            if key in ['historical_data', 'current_year_data', 'prediction_results']:
-                                st.session_state[key] = pd.DataFrame()
-                            else:
-                                st.session_state[key] = None
-                    
+                            st.session_state[key] = None
+                    set_trained_model(None)
+                    update_data_status()
+
                     st.session_state.reset_confirmation = False
                     st.success("✅ All system data has been reset!")
                     st.experimental_rerun()
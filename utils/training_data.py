@@ -3,16 +3,14 @@ Training Data tab functionality
 """
 
 import streamlit as st
-import pandas as pd
-from utils.common import upload_data_file
+from utils.common import upload_data_file, update_data_status, has_data
 
 def render_training_data_tab():
     """Render the Training Data tab content"""
     st.markdown("<div class='card-title'>📊 Training Data</div>", unsafe_allow_html=True)
     
-    # Initialize session state
-    if 'historical_data' not in st.session_state:
-        st.session_state.historical_data = pd.DataFrame()
+    # Initialize session state; None means nothing uploaded yet
+    st.session_state.setdefault('historical_data', None)
     
     # Action buttons row
     action_col1, action_col2 = st.columns([1, 4])
@@ -29,7 +27,8 @@ def render_training_data_tab():
                 del st.session_state.training_results
             if 'trained_model' in st.session_state:
                 del st.session_state.trained_model
-            
+            update_data_status()
+
             st.success("Training data cleared. Please upload new training data.")
             st.rerun()  # Use st.rerun() instead of experimental_rerun()
     
@@ -57,7 +56,7 @@ def render_training_data_tab():
     uploaded_data = upload_data_file(file_type="historical")
     
     # Data preview if available
-    if 'historical_data' in st.session_state and not st.session_state.historical_data.empty:
+    if has_data('historical_data'):
         st.markdown("### Data Preview")
         
         # Show data statistics
@@ -90,7 +89,7 @@ def render_training_data_tab():
                 st.metric("Non-CA Students", non_ca_count)
         
         # Data preview
-        st.dataframe(st.session_state.historical_data.head(10), use_container_width=True)
+        st.dataframe(st.session_state.historical_data.iloc[:10], use_container_width=True)
         
         # Data validation alerts
         validation_issues = []